@@ -67,7 +67,7 @@ const predefinedStrategies = [
 const defaultCustomCode = `# Custom Trading Strategy
 # 
 # Parameters:
-#   - data: pandas DataFrame with OHLCV data
+#   - data: pandas DataFrame with OHLCV data (read-only, keep indicators in local variables)
 #   - params: dictionary of strategy parameters
 #
 # Returns:
@@ -79,18 +79,18 @@ def custom_strategy(data, params):
     slow_period = params.get('slow_period', 30)
     
     # Calculate moving averages
-    data['fast_ma'] = data['close'].rolling(window=fast_period).mean()
-    data['slow_ma'] = data['close'].rolling(window=slow_period).mean()
+    fast_ma = data['close'].rolling(window=fast_period).mean()
+    slow_ma = data['close'].rolling(window=slow_period).mean()
     
     # Generate signals
     signals = pd.Series(0, index=data.index)
     
     # Buy signal: fast MA crosses above slow MA
-    buy_signal = (data['fast_ma'] > data['slow_ma']) & (data['fast_ma'].shift(1) <= data['slow_ma'].shift(1))
+    buy_signal = (fast_ma > slow_ma) & (fast_ma.shift(1) <= slow_ma.shift(1))
     signals[buy_signal] = 1
     
     # Sell signal: fast MA crosses below slow MA
-    sell_signal = (data['fast_ma'] < data['slow_ma']) & (data['fast_ma'].shift(1) >= data['slow_ma'].shift(1))
+    sell_signal = (fast_ma < slow_ma) & (fast_ma.shift(1) >= slow_ma.shift(1))
     signals[sell_signal] = -1
     
     return signals
@@ -14,7 +14,7 @@ import {
 import { Card } from '@/components/ui/card';
 import { Tabs, TabsContent, TabsList, TabsTrigger } from '@/components/ui/tabs';
 
-// Helper function to format date
+// Helper function to format date (epoch ms; shown in UTC, the dataset's own clock)
 const formatDate = (dateStr) => {
   if (!dateStr) return '';
   
@@ -22,7 +22,8 @@ const formatDate = (dateStr) => {
   return date.toLocaleDateString('en-US', {
     month: 'short',
     day: 'numeric',
-    year: 'numeric'
+    year: 'numeric',
+    timeZone: 'UTC'
   });
 };
 
@@ -46,19 +47,20 @@ export default function EquityCurve({ data }) {
   const [timeRange, setTimeRange] = useState('all');
   
   useEffect(() => {
-    if (!data || !Array.isArray(data)) {
+    if (!data || !Array.isArray(data.time) || !Array.isArray(data.equity)) {
       setChartData([]);
       return;
     }
     
-    // Process data to ensure proper date format and calculate percent change
-    const processedData = data.map((point, index) => {
-      const initialEquity = data[0]?.equity || 0;
-      const percentChange = ((point.equity - initialEquity) / initialEquity) * 100;
+    // Zip the parallel time (epoch ms) / equity arrays and calculate percent change
+    const initialEquity = data.equity[0] || 0;
+    const processedData = data.time.map((time, index) => {
+      const equity = data.equity[index];
+      const percentChange = ((equity - initialEquity) / initialEquity) * 100;
       
       return {
-        date: point.datetime,
-        equity: point.equity,
+        date: time,
+        equity: equity,
         percentChange: percentChange
       };
     });
@@ -91,7 +93,7 @@ export default function EquityCurve({ data }) {
   }, [data, timeRange]);
 
   // No data handling
-  if (!data || data.length === 0) {
+  if (!data || !data.equity || data.equity.length === 0) {
     return (
       <div className="flex items-center justify-center h-64 bg-muted/20 rounded-lg">
         <p className="text-muted-foreground">No equity data available</p>
@@ -139,7 +141,7 @@ export default function EquityCurve({ data }) {
                   dataKey="date" 
                   tickFormatter={(tick) => {
                     const date = new Date(tick);
-                    return date.toLocaleDateString('en-US', { month: 'short', day: 'numeric' });
+                    return date.toLocaleDateString('en-US', { month: 'short', day: 'numeric', timeZone: 'UTC' });
                   }}
                   minTickGap={30}
                   className="text-xs"
@@ -177,7 +179,7 @@ export default function EquityCurve({ data }) {
                   dataKey="date" 
                   tickFormatter={(tick) => {
                     const date = new Date(tick);
-                    return date.toLocaleDateString('en-US', { month: 'short', day: 'numeric' });
+                    return date.toLocaleDateString('en-US', { month: 'short', day: 'numeric', timeZone: 'UTC' });
                   }}
                   minTickGap={30}
                   className="text-xs"
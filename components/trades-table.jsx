@@ -22,10 +22,10 @@ import { Button } from '@/components/ui/button';
 import { Badge } from '@/components/ui/badge';
 import { Search } from 'lucide-react';
 
-// Format date
+// Format date (epoch ms; shown in UTC, the dataset's own clock)
 const formatDate = (dateStr) => {
   if (!dateStr) return '-';
-  return new Date(dateStr).toLocaleString();
+  return new Date(dateStr).toLocaleString(undefined, { timeZone: 'UTC' });
 };
 
 // Format currency
@@ -7,40 +7,186 @@ trading strategies on cryptocurrency data.
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Callable, Any, Tuple
+from typing import Dict, List, Callable, Any, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+import csv
+import itertools
+import os
+import tempfile
 import time
 import json
 
+try:
+    import bottleneck as bn
+except ImportError:
+    bn = None
+
+try:
+    import numexpr as ne
+except ImportError:
+    ne = None
+
+try:
+    from joblib import Parallel, delayed
+except ImportError:
+    Parallel = None
+
+from backtest_kernels import (BUY, SELL, NUMBA_AVAILABLE, ema, rolling_mean, 
+                              rsi_cross_signals, simulate, sma_cross_signals)
+
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+
+@dataclass
+class TradeLog:
+    '''
+    Trades of a backtest run stored as parallel arrays, one entry per trade.
+    
+    Trades alternate BUY, SELL, BUY, SELL, ...; the SELL-only fields
+    (pl, pl_pct) are NaN for buys.
+    '''
+    datetime: pd.Index
+    type: np.ndarray
+    price: np.ndarray
+    size: np.ndarray
+    value: np.ndarray
+    commission: np.ndarray
+    pl: np.ndarray
+    pl_pct: np.ndarray
+    
+    @classmethod
+    def empty(cls) -> 'TradeLog':
+        '''
+        Create a trade log without trades.
+        '''
+        return cls(pd.DatetimeIndex([]), np.empty(0, dtype=np.int8), 
+                   *(np.empty(0) for _ in range(6)))
+    
+    def to_records(self) -> List[Dict[str, Any]]:
+        '''
+        Convert the log to the list-of-dicts format used in the JSON output.
+        
+        Returns:
+            List with one dictionary per trade
+        '''
+        records = []
+        for timestamp, kind, price, size, value, commission, pl, pl_pct in zip(
+                self.datetime, self.type.tolist(), self.price.tolist(), self.size.tolist(), 
+                self.value.tolist(), self.commission.tolist(), self.pl.tolist(), 
+                self.pl_pct.tolist()):
+            if kind == BUY:
+                records.append({
+                    'datetime': timestamp,
+                    'type': 'BUY',
+                    'price': price,
+                    'size': size,
+                    'value': value,
+                    'commission': commission
+                })
+            else:
+                records.append({
+                    'datetime': timestamp,
+                    'type': 'SELL',
+                    'price': price,
+                    'size': size,
+                    'value': value,
+                    'pl': pl,
+                    'pl_pct': pl_pct,
+                    'commission': commission
+                })
+        return records
+
+
+@dataclass
+class PreparedDataset:
+    '''
+    Cleaned OHLCV data saved to .npy files that worker processes memory-map.
+    
+    Only the file paths are pickled when the dataset is sent to a worker; the
+    arrays themselves are opened with mmap_mode='r', so every worker reads the
+    same pages from the OS page cache instead of receiving its own copy.
+    '''
+    ohlcv_path: str
+    index_path: str
+    tz: str = None
+    
+    @classmethod
+    def create(cls, data: pd.DataFrame, directory: str) -> 'PreparedDataset':
+        '''
+        Save datetime-indexed OHLCV data (as held by BacktestEngine.data).
+        
+        Args:
+            data: DataFrame indexed by datetime with the OHLCV columns
+            directory: Directory to write ohlcv.npy and index.npy to
+            
+        Returns:
+            PreparedDataset pointing at the written files
+        '''
+        ohlcv_path = os.path.join(directory, 'ohlcv.npy')
+        index_path = os.path.join(directory, 'index.npy')
+        
+        # One row per column, so each column is contiguous once memory-mapped
+        np.save(ohlcv_path, np.ascontiguousarray(data[OHLCV_COLUMNS].to_numpy(dtype=np.float64).T))
+        np.save(index_path, data.index.as_unit('ns').asi8)
+        
+        tz = str(data.index.tz) if data.index.tz is not None else None
+        return cls(ohlcv_path, index_path, tz)
+    
+    def to_frame(self) -> pd.DataFrame:
+        '''
+        Rebuild the datetime-indexed OHLCV frame on top of the memory-mapped arrays.
+        
+        Returns:
+            Read-only DataFrame indexed by datetime with the OHLCV columns
+        '''
+        ohlcv = np.load(self.ohlcv_path, mmap_mode='r')
+        index = pd.DatetimeIndex(np.load(self.index_path, mmap_mode='r').view('datetime64[ns]'), 
+                                 name='datetime')
+        if self.tz is not None:
+            index = index.tz_localize('UTC').tz_convert(self.tz)
+        return pd.DataFrame(ohlcv.T, index=index, columns=OHLCV_COLUMNS, copy=False)
+
 
 class BacktestEngine:
     '''
     Core backtesting engine for cryptocurrency trading strategies.
     '''
     
-    def __init__(self, data: pd.DataFrame, initial_capital: float = 10000, 
+    def __init__(self, data: Union[pd.DataFrame, PreparedDataset], initial_capital: float = 10000, 
                  commission: float = 0.001):
         '''
         Initialize the backtesting engine.
         
+        The engine does not take ownership of `data` and never modifies it: the
+        datetime-indexed frame it works on is derived without an explicit copy,
+        so with pandas copy-on-write the price columns are shared, not duplicated.
+        
         Args:
-            data: DataFrame with OHLCV data
+            data: DataFrame with OHLCV data, or a PreparedDataset of already cleaned data
             initial_capital: Starting capital for the backtest
             commission: Trading commission as a decimal (e.g., 0.001 = 0.1%)
         '''
-        # Clean column names and ensure correct format
-        self.data = data.copy()
-        self.data.columns = [col.strip() for col in self.data.columns]
-        self.data['datetime'] = pd.to_datetime(self.data['datetime'])
-        self.data.set_index('datetime', inplace=True)
-        
-        # Ensure all required columns exist
-        required_cols = ['open', 'high', 'low', 'close', 'volume']
-        for col in required_cols:
-            if col not in self.data.columns:
-                raise ValueError(f"Required column '{col}' not found in data")
-        
-        # Sort by datetime index
-        self.data.sort_index(inplace=True)
+        if isinstance(data, PreparedDataset):
+            # Already cleaned, validated and sorted when the dataset was prepared
+            self.data = data.to_frame()
+        else:
+            # Clean column names (only when needed) and index by datetime
+            if any(col != col.strip() for col in data.columns):
+                data = data.rename(columns=str.strip)
+            self.data = data.set_index('datetime')
+            self.data.index = pd.to_datetime(self.data.index)
+            
+            # Ensure all required columns exist
+            for col in OHLCV_COLUMNS:
+                if col not in self.data.columns:
+                    raise ValueError(f"Required column '{col}' not found in data")
+            
+            # Sort by datetime index
+            if not self.data.index.is_monotonic_increasing:
+                self.data = self.data.sort_index()
         
         # Initialize backtest parameters
         self.initial_capital = initial_capital
@@ -51,28 +197,101 @@ class BacktestEngine:
         self.entry_price = 0.0
         
         # Initialize result tracking
-        self.trades = []
-        self.equity_curve = []
+        self.trades = TradeLog.empty()
         self.metrics = {}
+        
+        # Resampled data per timeframe, reused across runs on the same data
+        self._resample_cache: Dict[str, pd.DataFrame] = {}
+        
+        # Equity curve stored as a structure of arrays: one equity value per bar,
+        # indexed by the timestamps of the data the strategy ran on
+        self._equity_arr = None
+        self._data_index = None
+    
+    @property
+    def equity_curve(self) -> pd.Series:
+        '''
+        Equity at every bar of the last backtest run.
+        
+        Returns:
+            Series of equity values indexed by datetime
+        '''
+        if self._equity_arr is None:
+            return pd.Series(dtype=np.float64, name='equity')
+        return pd.Series(self._equity_arr, index=self._data_index, name='equity')
     
     def convert_timeframe(self, timeframe: str) -> pd.DataFrame:
         '''
         Convert data to a different timeframe.
         
+        Results are cached per timeframe, so repeated runs (e.g. parameter
+        sweeps) only resample once. The cache assumes self.data is not
+        modified after the engine is created.
+        
         Args:
             timeframe: Target timeframe (e.g., '30min', '1h', '4h', '1d')
             
         Returns:
             DataFrame with resampled data
         '''
-        resampled = self.data.resample(timeframe).agg({
-            'open': 'first',
-            'high': 'max',
-            'low': 'min',
-            'close': 'last',
-            'volume': 'sum'
-        })
-        return resampled.dropna()
+        if timeframe not in self._resample_cache:
+            resampled = self._resample_fixed(timeframe)
+            if resampled is None:
+                resampled = self.data.resample(timeframe).agg({
+                    'open': 'first',
+                    'high': 'max',
+                    'low': 'min',
+                    'close': 'last',
+                    'volume': 'sum'
+                }).dropna()
+            self._resample_cache[timeframe] = resampled
+        return self._resample_cache[timeframe]
+    
+    def _resample_fixed(self, timeframe: str) -> pd.DataFrame:
+        '''
+        Resample to a fixed-length timeframe with NumPy bucket reductions.
+        
+        Bars are bucketed by flooring their timestamps to the timeframe, and each
+        bucket is reduced with np.maximum/np.minimum/np.add.reduceat. This matches
+        pandas resample for timeframes that evenly divide a day.
+        
+        Args:
+            timeframe: Target timeframe
+            
+        Returns:
+            DataFrame with resampled data, or None if the fast path does not apply
+            (calendar offsets, timezone-aware or empty data, or missing values)
+        '''
+        try:
+            step = pd.Timedelta(timeframe)
+        except ValueError:
+            return None
+        if step <= pd.Timedelta(0) or pd.Timedelta(days=1) % step != pd.Timedelta(0):
+            return None
+        
+        index = self.data.index
+        if len(index) == 0 or index.tz is not None:
+            return None
+        values = self.data[OHLCV_COLUMNS].to_numpy(dtype=np.float64)
+        if np.isnan(values).any():
+            return None
+        
+        # Bucket boundaries: the index is sorted, so each bucket is a contiguous run
+        step_ns = step.value
+        buckets = index.values.astype('datetime64[ns]').view(np.int64) // step_ns
+        starts = np.flatnonzero(np.diff(buckets)) + 1
+        starts = np.concatenate(([0], starts))
+        ends = np.append(starts[1:], len(buckets)) - 1
+        
+        resampled_index = pd.DatetimeIndex((buckets[starts] * step_ns).astype('datetime64[ns]'), 
+                                           name=index.name).as_unit(index.unit)
+        return pd.DataFrame({
+            'open': values[starts, 0],
+            'high': np.maximum.reduceat(values[:, 1], starts),
+            'low': np.minimum.reduceat(values[:, 2], starts),
+            'close': values[ends, 3],
+            'volume': np.add.reduceat(values[:, 4], starts)
+        }, index=resampled_index)
     
     def run_strategy(self, strategy_func: Callable[[pd.DataFrame, Dict[str, Any]], pd.Series], 
                      params: Dict[str, Any] = None, 
@@ -81,6 +300,9 @@ class BacktestEngine:
         '''
         Run a backtest with the given strategy.
         
+        The DataFrame passed to strategy_func is the engine's own (cached) data,
+        not a copy; strategies must treat it as read-only.
+        
         Args:
             strategy_func: Function that generates buy/sell signals
             params: Parameters to pass to the strategy function
@@ -97,7 +319,7 @@ class BacktestEngine:
         if timeframe:
             data = self.convert_timeframe(timeframe)
         else:
-            data = self.data.copy()
+            data = self.data
             
         # Generate signals using the strategy function
         signals = strategy_func(data, params)
@@ -114,93 +336,123 @@ class BacktestEngine:
         self.position = 0
         self.position_size = 0.0
         self.entry_price = 0.0
-        self.trades = []
-        self.equity_curve = []
-        
-        # Run the backtest
-        total_bars = len(data)
-        for i, (timestamp, row) in enumerate(data.iterrows()):
-            # Calculate current equity
-            current_price = row['close']
-            current_equity = self.current_capital
-            if self.position > 0:
-                current_equity = self.current_capital + self.position_size * (current_price - self.entry_price)
-            
-            # Record equity
-            self.equity_curve.append({
-                'datetime': timestamp,
-                'equity': current_equity
-            })
-            
-            # Check for signal
-            signal = signals.iloc[i]
-            
-            # Process signal
-            if signal > 0 and self.position == 0:  # BUY signal
-                self.position = 1
-                self.entry_price = current_price
-                self.position_size = self.current_capital * (1 - self.commission) / current_price
-                
-                self.trades.append({
-                    'datetime': timestamp,
-                    'type': 'BUY',
-                    'price': current_price,
-                    'size': self.position_size,
-                    'value': self.position_size * current_price,
-                    'commission': self.current_capital * self.commission
-                })
-                
-            elif signal < 0 and self.position > 0:  # SELL signal
-                exit_price = current_price
-                exit_value = self.position_size * exit_price * (1 - self.commission)
-                pl = exit_value - (self.position_size * self.entry_price)
-                
-                self.trades.append({
-                    'datetime': timestamp,
-                    'type': 'SELL',
-                    'price': exit_price,
-                    'size': self.position_size,
-                    'value': exit_value,
-                    'pl': pl,
-                    'pl_pct': pl / (self.position_size * self.entry_price) * 100,
-                    'commission': exit_value * self.commission
-                })
-                
-                self.current_capital = exit_value
-                self.position = 0
-                self.position_size = 0.0
+        self._data_index = data.index
+        
+        # Run the backtest on raw arrays
+        close = data['close'].to_numpy(dtype=np.float64)
+        sig = signals.fillna(0).to_numpy(dtype=np.float64)
+        (trade_idx, trade_type, trade_price, 
+         trade_size, trade_pl, self._equity_arr) = simulate(close, sig, float(self.initial_capital), 
+                                                            float(self.commission))
+        self.trades = self._build_trade_log(data.index, trade_idx, trade_type, 
+                                            trade_price, trade_size, trade_pl)
+        
+        # Report progress via callback if provided (replayed after the simulation)
+        if callback:
+            self._report_progress(callback, data.index)
+        
+        # Calculate and return metrics
+        self.metrics = self.calculate_metrics()
+        return self.metrics
+    
+    def run_parameter_grid(self, strategy_func: Callable[[pd.DataFrame, Dict[str, Any]], pd.Series], 
+                           param_grid: Dict[str, List[Any]], 
+                           timeframe: str = None,
+                           n_jobs: int = -1) -> List[Dict[str, Any]]:
+        '''
+        Run a backtest for every combination of strategy parameters in parallel.
+        
+        Args:
+            strategy_func: Function that generates buy/sell signals (must be picklable)
+            param_grid: Mapping of parameter name to the list of values to try
+            timeframe: Optional timeframe to convert data to before running the strategy
+            n_jobs: Number of worker processes (-1 = one per CPU core)
             
-            # Report progress via callback if provided
-            if callback and i % max(1, total_bars // 100) == 0:
-                progress = {
-                    'progress': i / total_bars * 100,
-                    'current_equity': current_equity,
-                    'current_timestamp': timestamp
-                }
-                callback(progress)
-        
-        # Close any open position at the end of the backtest
-        if self.position > 0:
-            last_price = data.iloc[-1]['close']
-            exit_value = self.position_size * last_price * (1 - self.commission)
-            pl = exit_value - (self.position_size * self.entry_price)
+        Returns:
+            List of dictionaries with the params and metrics of each run. Equity
+            curves and trades are left out to keep inter-process traffic small.
+        '''
+        names = list(param_grid)
+        combinations = [dict(zip(names, values)) 
+                        for values in itertools.product(*(param_grid[name] for name in names))]
+        
+        # Resample once up front and write the result to memory-mapped files;
+        # workers only receive the file paths and share the pages via the OS page cache
+        data = self.convert_timeframe(timeframe) if timeframe else self.data
+        
+        with tempfile.TemporaryDirectory() as directory:
+            dataset = PreparedDataset.create(data, directory)
+            run_one = partial(_run_one, dataset, strategy_func, self.initial_capital, self.commission)
             
-            self.trades.append({
-                'datetime': data.index[-1],
-                'type': 'SELL',
-                'price': last_price,
-                'size': self.position_size,
-                'value': exit_value,
-                'pl': pl,
-                'pl_pct': pl / (self.position_size * self.entry_price) * 100,
-                'commission': exit_value * self.commission
+            if Parallel is not None:
+                results = Parallel(n_jobs=n_jobs, backend='loky')(
+                    delayed(run_one)(params) for params in combinations
+                )
+            else:
+                with ProcessPoolExecutor(max_workers=None if n_jobs < 0 else n_jobs) as executor:
+                    results = list(executor.map(run_one, combinations))
+        
+        return [{'params': params, 'metrics': metrics} 
+                for params, metrics in zip(combinations, results)]
+    
+    def _report_progress(self, callback: Callable[[Dict[str, Any]], None], 
+                         timestamps: pd.Index) -> None:
+        '''
+        Replay progress reports for roughly every 1% of bars from the equity curve.
+        
+        Args:
+            callback: Callback function receiving the progress dictionaries
+            timestamps: Bar timestamps
+        '''
+        total_bars = len(timestamps)
+        report_at = np.arange(0, total_bars, max(1, total_bars // 100))
+        
+        # Gather all reported values up front; the loop only invokes the callback
+        progress = (report_at / total_bars * 100).tolist()
+        equity = self._equity_arr[report_at].tolist()
+        for pct, current_equity, timestamp in zip(progress, equity, timestamps[report_at]):
+            callback({
+                'progress': pct,
+                'current_equity': current_equity,
+                'current_timestamp': timestamp
             })
+    
+    def _build_trade_log(self, timestamps: pd.Index, trade_idx: np.ndarray, 
+                         trade_type: np.ndarray, trade_price: np.ndarray, 
+                         trade_size: np.ndarray, trade_pl: np.ndarray) -> TradeLog:
+        '''
+        Build the trade log from the simulator's output arrays.
+        
+        Args:
+            timestamps: Bar timestamps
+            trade_idx: Bar index of each trade
+            trade_type: Trade type codes (BUY / SELL)
+            trade_price: Execution price of each trade
+            trade_size: Position size of each trade
+            trade_pl: Profit/loss of each trade (NaN for buys)
             
-            self.current_capital = exit_value
+        Returns:
+            TradeLog with the trades of the run
+        '''
+        buys = trade_type == BUY
+        sells = ~buys
         
-        # Calculate and return metrics
-        self.metrics = self.calculate_metrics()
-        return self.metrics
+        value = trade_size * trade_price
+        value[sells] *= (1 - self.commission)
+        
+        # Buys are paid for with the proceeds of the previous sell
+        exit_values = value[sells]
+        capital_before = np.concatenate(([self.initial_capital], exit_values[:-1]))
+        commission = value * self.commission
+        commission[buys] = capital_before * self.commission
+        
+        pl_pct = np.full(len(trade_type), np.nan)
+        pl_pct[sells] = trade_pl[sells] / (trade_size[sells] * trade_price[buys]) * 100
+        
+        self.current_capital = exit_values[-1] if len(exit_values) else self.initial_capital
+        
+        return TradeLog(timestamps[trade_idx], trade_type, trade_price, trade_size, 
+                        value, commission, trade_pl, pl_pct)
     
     def calculate_metrics(self) -> Dict[str, Any]:
         '''
@@ -209,53 +461,50 @@ class BacktestEngine:
         Returns:
             Dictionary with performance metrics
         '''
-        # Filter completed trades (buy and sell pairs)
-        completed_trades = [t for t in self.trades if t['type'] == 'SELL']
+        # Profit/loss of completed trades (buy and sell pairs)
+        pls = self.trades.pl[self.trades.type == SELL]
         
         # If no completed trades, return minimal metrics
-        if not completed_trades:
+        if not len(pls):
             return {
                 'total_trades': 0,
                 'net_profit_pct': 0,
                 'equity_curve': self.equity_curve
             }
         
-        # Extract profit/loss data
-        pls = [t['pl'] for t in completed_trades]
-        pl_pcts = [t['pl_pct'] for t in completed_trades]
-        
-        # Calculate equity curve
-        equity_series = pd.Series([e['equity'] for e in self.equity_curve], 
-                                index=[e['datetime'] for e in self.equity_curve])
-        
-        # Calculate drawdowns
-        running_max = equity_series.cummax()
-        drawdowns = (equity_series - running_max) / running_max * 100
-        max_drawdown = drawdowns.min()
+        # Calculate drawdowns (skipping NaN equity from missing close prices, like pandas)
+        equity = self._equity_arr
+        running_max = np.fmax.accumulate(equity)
+        drawdowns = (equity - running_max) / running_max
+        max_drawdown = np.nanmin(drawdowns) * 100
         
         # Calculate winning and losing trades
-        winning_trades = [pl for pl in pls if pl > 0]
-        losing_trades = [pl for pl in pls if pl <= 0]
+        winning_trades = pls[pls > 0]
+        losing_trades = pls[pls <= 0]
         
         # Avoid division by zero
-        avg_win = np.mean(winning_trades) if winning_trades else 0
-        avg_loss = np.mean(losing_trades) if losing_trades else 0
+        avg_win = winning_trades.mean() if len(winning_trades) else 0
+        avg_loss = losing_trades.mean() if len(losing_trades) else 0
         win_loss_ratio = abs(avg_win / avg_loss) if avg_loss != 0 and avg_win != 0 else 0
         
         # Calculate returns
         total_return = (self.current_capital - self.initial_capital) / self.initial_capital * 100
         
         # Calculate annualized metrics
-        days = (self.equity_curve[-1]['datetime'] - self.equity_curve[0]['datetime']).days
+        days = (self._data_index[-1] - self._data_index[0]).days
         if days < 1:
             days = 1  # Avoid division by zero
             
         annual_return = total_return / days * 365
         
-        # Calculate Sharpe ratio (assuming risk-free rate of 0)
-        daily_returns = equity_series.pct_change().dropna()
-        if len(daily_returns) > 1:
-            sharpe = np.sqrt(252) * daily_returns.mean() / daily_returns.std()
+        # Calculate Sharpe ratio (assuming risk-free rate of 0) from the
+        # closing equity of each calendar day
+        _, day_starts = np.unique(self._data_index.values.astype('datetime64[D]'), return_index=True)
+        daily_equity = equity[np.append(day_starts[1:] - 1, len(equity) - 1)]
+        daily_returns = daily_equity[1:] / daily_equity[:-1] - 1
+        daily_std = np.std(daily_returns, ddof=1) if len(daily_returns) > 1 else 0
+        if daily_std > 0:
+            sharpe = np.sqrt(252) * np.mean(daily_returns) / daily_std
         else:
             sharpe = 0
             
@@ -268,10 +517,10 @@ class BacktestEngine:
             'final_capital': self.current_capital,
             'total_return': total_return,
             'annual_return': annual_return,
-            'total_trades': len(completed_trades),
+            'total_trades': len(pls),
             'winning_trades': len(winning_trades),
             'losing_trades': len(losing_trades),
-            'win_rate': len(winning_trades) / len(completed_trades) if completed_trades else 0,
+            'win_rate': len(winning_trades) / len(pls),
             'avg_win': avg_win,
             'avg_loss': avg_loss,
             'avg_win_loss_ratio': win_loss_ratio,
@@ -285,11 +534,198 @@ class BacktestEngine:
         return metrics
 
 
+def _run_one(dataset: PreparedDataset, 
+             strategy_func: Callable[[pd.DataFrame, Dict[str, Any]], pd.Series], 
+             initial_capital: float, commission: float, 
+             params: Dict[str, Any]) -> Dict[str, Any]:
+    '''
+    Run a single parameter combination of a grid search (executed in a worker).
+    
+    Args:
+        dataset: Prepared OHLCV data to memory-map
+        strategy_func: Function that generates buy/sell signals
+        initial_capital: Starting capital for the backtest
+        commission: Trading commission as a decimal
+        params: Parameters to pass to the strategy function
+        
+    Returns:
+        Dictionary with performance metrics, without equity curve and trades
+    '''
+    backtester = BacktestEngine(dataset, initial_capital=initial_capital, commission=commission)
+    metrics = backtester.run_strategy(strategy_func, params)
+    metrics.pop('equity_curve', None)
+    metrics.pop('trades', None)
+    return metrics
+
+
+def _flat_windows(values: np.ndarray, window: int) -> np.ndarray:
+    '''
+    Detect bars whose trailing window holds a single repeated value.
+    
+    Args:
+        values: Input values
+        window: Window length
+        
+    Returns:
+        Boolean array, True where the last `window` values are identical (and not NaN)
+    '''
+    positions = np.arange(len(values))
+    run_starts = np.ones(len(values), dtype=bool)
+    run_starts[1:] = values[1:] != values[:-1]
+    run_start = np.maximum.accumulate(np.where(run_starts, positions, 0))
+    return (positions - run_start + 1 >= window) & ~np.isnan(values)
+
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    '''
+    Rolling mean of a float array, NaN until the window is full.
+    
+    Uses Bottleneck when installed, then the numba kernel, then pandas.
+    
+    Args:
+        values: Input values
+        window: Window length
+        
+    Returns:
+        Array of rolling means
+    '''
+    if window > len(values):
+        return np.full(len(values), np.nan, dtype=values.dtype)
+    if bn is not None:
+        # Bottleneck accumulates in the input precision, so float32 input is widened
+        result = bn.move_mean(values.astype(np.float64, copy=False), window, 
+                              min_count=window).astype(values.dtype, copy=False)
+        # Like pandas, a window of identical values yields that value exactly
+        flat = _flat_windows(values, window)
+        result[flat] = values[flat]
+        return result
+    if NUMBA_AVAILABLE:
+        return rolling_mean(values, window)
+    return pd.Series(values).rolling(window=window).mean().to_numpy(dtype=values.dtype)
+
+
+def _rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    '''
+    Rolling sample standard deviation (ddof=1) of a float array.
+    
+    Uses Bottleneck when installed, otherwise pandas.
+    
+    Args:
+        values: Input values
+        window: Window length
+        
+    Returns:
+        Array of rolling standard deviations, NaN until the window is full
+    '''
+    # The sample standard deviation needs at least two values per window
+    if window > len(values) or window < 2:
+        return np.full(len(values), np.nan, dtype=values.dtype)
+    if bn is not None:
+        # Bottleneck accumulates in the input precision, so float32 input is widened
+        result = bn.move_std(values.astype(np.float64, copy=False), window, 
+                             min_count=window, ddof=1).astype(values.dtype, copy=False)
+        # Like pandas, a window of identical values has a standard deviation of exactly 0
+        result[_flat_windows(values, window)] = 0
+        return result
+    return pd.Series(values).rolling(window=window).std().to_numpy(dtype=values.dtype)
+
+
+def _ema(values: np.ndarray, span: int) -> np.ndarray:
+    '''
+    Exponential moving average of a float array (pandas adjust=False semantics).
+    
+    Uses the numba kernel when available, otherwise pandas ewm.
+    
+    Args:
+        values: Input values
+        span: EMA span
+        
+    Returns:
+        Array of EMA values
+    '''
+    if NUMBA_AVAILABLE:
+        return ema(values, float(span))
+    return pd.Series(values).ewm(span=span, adjust=False).mean().to_numpy(dtype=values.dtype)
+
+
+def _cross_above(a: np.ndarray, b) -> np.ndarray:
+    '''
+    Detect bars where series a crosses above b.
+    
+    Args:
+        a: Indicator values
+        b: Indicator values or a scalar threshold
+        
+    Returns:
+        Boolean array, True where a > b and a <= b on the previous bar
+    '''
+    b = np.broadcast_to(b, a.shape)
+    crossed = np.zeros(a.shape, dtype=bool)
+    crossed[1:] = (a[1:] > b[1:]) & (a[:-1] <= b[:-1])
+    return crossed
+
+
+def _cross_below(a: np.ndarray, b) -> np.ndarray:
+    '''
+    Detect bars where series a crosses below b.
+    
+    Args:
+        a: Indicator values
+        b: Indicator values or a scalar threshold
+        
+    Returns:
+        Boolean array, True where a < b and a >= b on the previous bar
+    '''
+    b = np.broadcast_to(b, a.shape)
+    crossed = np.zeros(a.shape, dtype=bool)
+    crossed[1:] = (a[1:] < b[1:]) & (a[:-1] >= b[:-1])
+    return crossed
+
+
+def _exits(mask: np.ndarray) -> np.ndarray:
+    '''
+    Detect bars where a condition stops holding.
+    
+    Args:
+        mask: Boolean condition per bar
+        
+    Returns:
+        Boolean array, True where mask is False and was True on the previous bar
+    '''
+    exited = np.zeros(mask.shape, dtype=bool)
+    exited[1:] = ~mask[1:] & mask[:-1]
+    return exited
+
+
+def _to_signals(index: pd.Index, buy_signal: np.ndarray, sell_signal: np.ndarray) -> pd.Series:
+    '''
+    Combine buy and sell masks into an int8 signal Series (sells take precedence).
+    '''
+    signals = np.zeros(len(index), dtype=np.int8)
+    signals[buy_signal] = 1
+    signals[sell_signal] = -1
+    return pd.Series(signals, index=index, copy=False)
+
+
 class StrategyLibrary:
     '''
     Library of pre-defined trading strategies for the backtester.
     '''
     
+    # Opt-in float32 input for the fused SMA/RSI kernels (they still accumulate in
+    # float64): halves the bytes they read, but at BTC-scale prices near-crossings
+    # can flip, so signals no longer match float64 or the non-numba path exactly.
+    # All other indicator paths always use float64.
+    USE_FP32 = False
+    
+    @staticmethod
+    def _close_prices(data: pd.DataFrame) -> np.ndarray:
+        '''
+        Close prices as an array in the fused kernels' input precision (see USE_FP32).
+        '''
+        dtype = np.float32 if StrategyLibrary.USE_FP32 else np.float64
+        return data['close'].to_numpy(dtype=dtype)
+    
     @staticmethod
     def simple_moving_average_crossover(data: pd.DataFrame, params: Dict[str, Any]) -> pd.Series:
         '''
@@ -307,22 +743,25 @@ class StrategyLibrary:
         fast_period = params.get('fast_period', 10)
         slow_period = params.get('slow_period', 50)
         
-        # Calculate moving averages
-        fast_ma = data['close'].rolling(window=fast_period).mean()
-        slow_ma = data['close'].rolling(window=slow_period).mean()
+        # With numba, compute averages and crossovers in a single fused pass
+        if NUMBA_AVAILABLE:
+            close = StrategyLibrary._close_prices(data)
+            return pd.Series(sma_cross_signals(close, fast_period, slow_period), 
+                             index=data.index, copy=False)
         
-        # Generate signals
-        signals = pd.Series(0, index=data.index)
+        # Calculate moving averages in float64, the precision the fused kernel
+        # compares in, so signals don't depend on whether numba is installed
+        close = data['close'].to_numpy(dtype=np.float64)
+        fast_ma = _rolling_mean(close, fast_period)
+        slow_ma = _rolling_mean(close, slow_period)
         
         # Buy signal: fast MA crosses above slow MA
-        buy_signal = (fast_ma > slow_ma) & (fast_ma.shift(1) <= slow_ma.shift(1))
-        signals[buy_signal] = 1
+        buy_signal = _cross_above(fast_ma, slow_ma)
         
         # Sell signal: fast MA crosses below slow MA
-        sell_signal = (fast_ma < slow_ma) & (fast_ma.shift(1) >= slow_ma.shift(1))
-        signals[sell_signal] = -1
+        sell_signal = _cross_below(fast_ma, slow_ma)
         
-        return signals
+        return _to_signals(data.index, buy_signal, sell_signal)
     
     @staticmethod
     def rsi_strategy(data: pd.DataFrame, params: Dict[str, Any]) -> pd.Series:
@@ -343,29 +782,35 @@ class StrategyLibrary:
         overbought = params.get('overbought', 70)
         oversold = params.get('oversold', 30)
         
-        # Calculate RSI
-        delta = data['close'].diff()
-        gain = delta.where(delta > 0, 0)
-        loss = -delta.where(delta < 0, 0)
+        # With numba, compute RSI and threshold crossings in a single fused pass
+        if NUMBA_AVAILABLE:
+            close = StrategyLibrary._close_prices(data)
+            return pd.Series(rsi_cross_signals(close, period, overbought, oversold), 
+                             index=data.index, copy=False)
         
-        avg_gain = gain.rolling(window=period).mean()
-        avg_loss = loss.rolling(window=period).mean()
+        # Calculate RSI in float64, the precision the fused kernel compares in,
+        # so signals don't depend on whether numba is installed
+        close = data['close'].to_numpy(dtype=np.float64)
+        delta = np.empty_like(close)
+        delta[:1] = 0.0
+        np.subtract(close[1:], close[:-1], out=delta[1:])
+        gain = np.fmax(delta, 0.0)
+        loss = np.fmax(-delta, 0.0)
         
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
+        avg_gain = _rolling_mean(gain, period)
+        avg_loss = _rolling_mean(loss, period)
         
-        # Generate signals
-        signals = pd.Series(0, index=data.index)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = avg_gain / avg_loss
+            rsi = 100 - (100 / (1 + rs))
         
         # Buy signal: RSI crosses above oversold threshold
-        buy_signal = (rsi > oversold) & (rsi.shift(1) <= oversold)
-        signals[buy_signal] = 1
+        buy_signal = _cross_above(rsi, oversold)
         
         # Sell signal: RSI crosses below overbought threshold
-        sell_signal = (rsi < overbought) & (rsi.shift(1) >= overbought)
-        signals[sell_signal] = -1
+        sell_signal = _cross_below(rsi, overbought)
         
-        return signals
+        return _to_signals(data.index, buy_signal, sell_signal)
     
     @staticmethod
     def bollinger_bands_strategy(data: pd.DataFrame, params: Dict[str, Any]) -> pd.Series:
@@ -384,26 +829,30 @@ class StrategyLibrary:
         period = params.get('period', 20)
         std_dev = params.get('std_dev', 2)
         
-        # Calculate Bollinger Bands
-        middle_band = data['close'].rolling(window=period).mean()
-        std = data['close'].rolling(window=period).std()
-        upper_band = middle_band + std_dev * std
-        lower_band = middle_band - std_dev * std
-        
-        # Generate signals
-        signals = pd.Series(0, index=data.index)
+        # Calculate Bollinger Bands in float64 regardless of USE_FP32: float32 cannot
+        # resolve the price-to-band distance near the price level
+        close = data['close'].to_numpy(dtype=np.float64)
+        middle_band = _rolling_mean(close, period)
+        std = _rolling_std(close, period)
+        
+        # Compare price against the bands without materializing them; numexpr
+        # evaluates each band and comparison in one fused pass
+        if ne is not None:
+            band_vars = {'close': close, 'mid': middle_band, 'sd': std, 
+                         'k': np.asarray(std_dev, dtype=close.dtype)}
+            price_below_lower = ne.evaluate('close < mid - k * sd', local_dict=band_vars)
+            price_above_upper = ne.evaluate('close > mid + k * sd', local_dict=band_vars)
+        else:
+            price_below_lower = close < middle_band - std_dev * std
+            price_above_upper = close > middle_band + std_dev * std
         
         # Buy signal: price crosses below lower band and then back above it
-        price_below_lower = data['close'] < lower_band
-        buy_signal = (~price_below_lower) & (price_below_lower.shift(1))
-        signals[buy_signal] = 1
+        buy_signal = _exits(price_below_lower)
         
         # Sell signal: price crosses above upper band and then back below it
-        price_above_upper = data['close'] > upper_band
-        sell_signal = (~price_above_upper) & (price_above_upper.shift(1))
-        signals[sell_signal] = -1
+        sell_signal = _exits(price_above_upper)
         
-        return signals
+        return _to_signals(data.index, buy_signal, sell_signal)
 
     @staticmethod
     def macd_strategy(data: pd.DataFrame, params: Dict[str, Any]) -> pd.Series:
@@ -424,30 +873,49 @@ class StrategyLibrary:
         slow_period = params.get('slow_period', 26)
         signal_period = params.get('signal_period', 9)
         
-        # Calculate MACD
-        fast_ema = data['close'].ewm(span=fast_period, adjust=False).mean()
-        slow_ema = data['close'].ewm(span=slow_period, adjust=False).mean()
+        # Calculate MACD in float64 regardless of USE_FP32: the MACD line is the
+        # small difference of two EMAs near the price level, which float32 cannot resolve
+        close = data['close'].to_numpy(dtype=np.float64)
+        fast_ema = _ema(close, fast_period)
+        slow_ema = _ema(close, slow_period)
         macd_line = fast_ema - slow_ema
-        signal_line = macd_line.ewm(span=signal_period, adjust=False).mean()
-        
-        # Generate signals
-        signals = pd.Series(0, index=data.index)
+        signal_line = _ema(macd_line, signal_period)
         
         # Buy signal: MACD line crosses above signal line
-        buy_signal = (macd_line > signal_line) & (macd_line.shift(1) <= signal_line.shift(1))
-        signals[buy_signal] = 1
+        buy_signal = _cross_above(macd_line, signal_line)
         
         # Sell signal: MACD line crosses below signal line
-        sell_signal = (macd_line < signal_line) & (macd_line.shift(1) >= signal_line.shift(1))
-        signals[sell_signal] = -1
+        sell_signal = _cross_below(macd_line, signal_line)
         
-        return signals
+        return _to_signals(data.index, buy_signal, sell_signal)
+
+
+def _read_csv(file_path: str) -> pd.DataFrame:
+    '''
+    Parse a CSV file, using the multithreaded pyarrow parser when possible.
+    
+    The OHLCV columns are read as float64. Their dtypes are keyed on the names
+    exactly as they appear in the header, since the documented format puts a
+    space before each name (e.g. ' open'). Falls back to the default C parser
+    when pyarrow is not installed or the file is not regular enough for it
+    (e.g. rows with trailing delimiters).
+    '''
+    with open(file_path, newline='') as f:
+        header = next(csv.reader(f), [])
+    columns = {col.strip(): col for col in header}
+    dtype = {columns[col]: 'float64' for col in OHLCV_COLUMNS if col in columns}
+    
+    try:
+        return pd.read_csv(file_path, engine='pyarrow', dtype=dtype, 
+                           parse_dates=[columns['datetime']] if 'datetime' in columns else False)
+    except (ImportError, ValueError):
+        return pd.read_csv(file_path, dtype=dtype)
 
 
 # Function to load OHLCV data from a CSV file
 def load_data_from_csv(file_path: str) -> pd.DataFrame:
     '''
-    Load OHLCV data from a CSV file.
+    Load OHLCV data from a CSV (or Parquet) file.
     
     Args:
         file_path: Path to the CSV file
@@ -455,7 +923,10 @@ def load_data_from_csv(file_path: str) -> pd.DataFrame:
     Returns:
         DataFrame with OHLCV data
     '''
-    data = pd.read_csv(file_path)
+    if file_path.endswith('.parquet'):
+        data = pd.read_parquet(file_path)
+    else:
+        data = _read_csv(file_path)
     
     # Clean column names
     data.columns = [col.strip() for col in data.columns]
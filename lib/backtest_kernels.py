@@ -0,0 +1,345 @@
+'''
+Backtest Kernels
+----------------
+Array-level simulation and indicator kernels used by the backtest engine.
+When numba is installed the loops are compiled to native code, otherwise
+they run as plain Python/NumPy.
+'''
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        '''
+        No-op stand-in for numba.njit when numba is not installed.
+        
+        Supports both the bare ``@njit`` and the ``@njit(cache=True)`` forms.
+        '''
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        
+        def decorator(func):
+            return func
+        
+        return decorator
+
+
+# Trade type codes used in the trade_type output array
+BUY = 1
+SELL = -1
+
+
+@njit(cache=True)
+def simulate(close, signal, initial_capital, commission):
+    '''
+    Simulate a long-only strategy, visiting only the bars that carry a signal.
+    
+    The equity curve is filled segment by segment between trades: flat
+    segments carry the current capital, position segments are marked to
+    market against the entry price.
+    
+    Args:
+        close: Close prices (float64)
+        signal: Signals (positive = buy, negative = sell)
+        initial_capital: Starting capital
+        commission: Trading commission as a decimal
+    
+    Returns:
+        Tuple of (trade_idx, trade_type, trade_price, trade_size, trade_pl, equity)
+    '''
+    n = close.shape[0]
+    events = np.flatnonzero(signal)
+    fee_factor = 1.0 - commission
+    
+    # At most one trade per signal bar, plus the closing trade at the end
+    max_trades = events.shape[0] + 1
+    equity = np.empty(n, dtype=np.float64)
+    trade_idx = np.empty(max_trades, dtype=np.int64)
+    trade_type = np.empty(max_trades, dtype=np.int8)
+    trade_price = np.empty(max_trades, dtype=np.float64)
+    trade_size = np.empty(max_trades, dtype=np.float64)
+    trade_pl = np.empty(max_trades, dtype=np.float64)
+    n_trades = 0
+    
+    capital = initial_capital
+    in_position = False
+    size = 0.0
+    entry_price = 0.0
+    segment_start = 0
+    
+    for i in events:
+        if signal[i] > 0 and not in_position:
+            # Equity on the entry bar is recorded before the position is opened
+            equity[segment_start:i + 1] = capital
+            segment_start = i + 1
+            
+            in_position = True
+            entry_price = close[i]
+            size = capital * fee_factor / entry_price
+            
+            trade_idx[n_trades] = i
+            trade_type[n_trades] = BUY
+            trade_price[n_trades] = entry_price
+            trade_size[n_trades] = size
+            trade_pl[n_trades] = np.nan
+            n_trades += 1
+        
+        elif signal[i] < 0 and in_position:
+            # Equity on the exit bar is recorded before the position is closed
+            equity[segment_start:i + 1] = capital + size * (close[segment_start:i + 1] - entry_price)
+            segment_start = i + 1
+            
+            price = close[i]
+            exit_value = size * price * fee_factor
+            
+            trade_idx[n_trades] = i
+            trade_type[n_trades] = SELL
+            trade_price[n_trades] = price
+            trade_size[n_trades] = size
+            trade_pl[n_trades] = exit_value - size * entry_price
+            n_trades += 1
+            
+            capital = exit_value
+            in_position = False
+    
+    if in_position:
+        equity[segment_start:] = capital + size * (close[segment_start:] - entry_price)
+        
+        # Close any open position at the end of the backtest
+        price = close[n - 1]
+        exit_value = size * price * fee_factor
+        
+        trade_idx[n_trades] = n - 1
+        trade_type[n_trades] = SELL
+        trade_price[n_trades] = price
+        trade_size[n_trades] = size
+        trade_pl[n_trades] = exit_value - size * entry_price
+        n_trades += 1
+    else:
+        equity[segment_start:] = capital
+    
+    return (trade_idx[:n_trades], trade_type[:n_trades], trade_price[:n_trades],
+            trade_size[:n_trades], trade_pl[:n_trades], equity)
+
+
+@njit(cache=True)
+def rolling_mean(values, window):
+    '''
+    Rolling mean over a fixed window in a single pass.
+    
+    Matches pandas' rolling(window).mean(): the result is NaN until the
+    window holds `window` non-NaN values, and a window of identical values
+    yields that value exactly (no running-sum residue). Sums are accumulated
+    in float64; the output has the dtype of the input.
+    
+    Args:
+        values: Input values (float32 or float64)
+        window: Window length
+    
+    Returns:
+        Array of rolling means
+    '''
+    n = values.shape[0]
+    out = np.empty(n, dtype=values.dtype)
+    total = 0.0
+    count = 0
+    prev_value = np.nan
+    same_count = 0
+    
+    for i in range(n):
+        value = values[i]
+        if not np.isnan(value):
+            total += value
+            count += 1
+            same_count = same_count + 1 if value == prev_value else 1
+            prev_value = value
+        if i >= window:
+            old = values[i - window]
+            if not np.isnan(old):
+                total -= old
+                count -= 1
+        if count < window:
+            out[i] = np.nan
+        elif same_count >= window:
+            out[i] = prev_value
+        else:
+            out[i] = total / window
+    
+    return out
+
+
+@njit(cache=True)
+def ema(values, span):
+    '''
+    Exponential moving average via the recursion y[i] = a*x[i] + (1-a)*y[i-1].
+    
+    Mirrors pandas' ewm(span=span, adjust=False).mean(), including how
+    leading and interior NaNs are handled. The recursion runs in float64;
+    the output has the dtype of the input.
+    
+    Args:
+        values: Input values (float32 or float64)
+        span: EMA span
+    
+    Returns:
+        Array of EMA values
+    '''
+    n = values.shape[0]
+    out = np.empty(n, dtype=values.dtype)
+    if n == 0:
+        return out
+    
+    alpha = 1.0 / (1.0 + (span - 1.0) / 2.0)
+    old_wt_factor = 1.0 - alpha
+    old_wt = 1.0
+    weighted = values[0]
+    out[0] = weighted
+    
+    for i in range(1, n):
+        value = values[i]
+        if not np.isnan(weighted):
+            old_wt *= old_wt_factor
+            if not np.isnan(value):
+                if weighted != value:
+                    weighted = (old_wt * weighted + alpha * value) / (old_wt + alpha)
+                old_wt = 1.0
+        elif not np.isnan(value):
+            weighted = value
+        out[i] = weighted
+    
+    return out
+
+
+@njit(cache=True)
+def sma_cross_signals(close, fast_period, slow_period):
+    '''
+    Fused SMA crossover: moving averages and signals in one pass over close.
+    
+    Both averages are maintained as running window sums (float64), and the
+    crossover test uses the same comparisons as the array-based strategy, so
+    no intermediate indicator arrays are materialized. As in rolling_mean, a
+    window of identical prices yields that price exactly.
+    
+    Args:
+        close: Close prices (float32 or float64)
+        fast_period: Period for the fast moving average
+        slow_period: Period for the slow moving average
+    
+    Returns:
+        int8 array of signals (1 = buy, -1 = sell, 0 = no action)
+    '''
+    n = close.shape[0]
+    out = np.zeros(n, dtype=np.int8)
+    fast_sum = 0.0
+    slow_sum = 0.0
+    fast_count = 0
+    slow_count = 0
+    prev_fast = np.nan
+    prev_slow = np.nan
+    prev_value = np.nan
+    same_count = 0
+    
+    for i in range(n):
+        value = close[i]
+        if not np.isnan(value):
+            fast_sum += value
+            slow_sum += value
+            fast_count += 1
+            slow_count += 1
+            same_count = same_count + 1 if value == prev_value else 1
+            prev_value = value
+        if i >= fast_period:
+            old = close[i - fast_period]
+            if not np.isnan(old):
+                fast_sum -= old
+                fast_count -= 1
+        if i >= slow_period:
+            old = close[i - slow_period]
+            if not np.isnan(old):
+                slow_sum -= old
+                slow_count -= 1
+        
+        fast_ma = np.nan
+        if fast_count == fast_period:
+            fast_ma = prev_value if same_count >= fast_period else fast_sum / fast_period
+        slow_ma = np.nan
+        if slow_count == slow_period:
+            slow_ma = prev_value if same_count >= slow_period else slow_sum / slow_period
+        
+        if fast_ma > slow_ma and prev_fast <= prev_slow:
+            out[i] = 1
+        elif fast_ma < slow_ma and prev_fast >= prev_slow:
+            out[i] = -1
+        
+        prev_fast = fast_ma
+        prev_slow = slow_ma
+    
+    return out
+
+
+@njit(cache=True)
+def rsi_cross_signals(close, period, overbought, oversold):
+    '''
+    Fused RSI strategy: gains/losses, their rolling means, RSI and threshold
+    crossings in one pass over close. As in rolling_mean, a window of
+    identical gains (or losses) yields that value exactly.
+    
+    Args:
+        close: Close prices (float32 or float64)
+        period: RSI calculation period
+        overbought: Overbought threshold
+        oversold: Oversold threshold
+    
+    Returns:
+        int8 array of signals (1 = buy, -1 = sell, 0 = no action)
+    '''
+    n = close.shape[0]
+    out = np.zeros(n, dtype=np.int8)
+    gain_sum = 0.0
+    loss_sum = 0.0
+    prev_gain = np.nan
+    prev_loss = np.nan
+    gain_same = 0
+    loss_same = 0
+    prev_rsi = np.nan
+    
+    for i in range(n):
+        # Missing deltas count as no change, like the array-based strategy
+        delta = close[i] - close[i - 1] if i > 0 else 0.0
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        gain_sum += gain
+        loss_sum += loss
+        gain_same = gain_same + 1 if gain == prev_gain else 1
+        loss_same = loss_same + 1 if loss == prev_loss else 1
+        prev_gain = gain
+        prev_loss = loss
+        if i >= period:
+            old = close[i - period] - close[i - period - 1] if i > period else 0.0
+            if old > 0:
+                gain_sum -= old
+            elif old < 0:
+                loss_sum += old
+        
+        rsi = np.nan
+        if i >= period - 1:
+            avg_gain = gain if gain_same >= period else gain_sum / period
+            avg_loss = loss if loss_same >= period else loss_sum / period
+            if avg_loss != 0:
+                rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+            elif avg_gain != 0:
+                rsi = 100.0
+        
+        if rsi < overbought and prev_rsi >= overbought:
+            out[i] = -1
+        elif rsi > oversold and prev_rsi <= oversold:
+            out[i] = 1
+        
+        prev_rsi = rsi
+    
+    return out
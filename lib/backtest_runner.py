@@ -11,9 +11,15 @@ import json
 import sys
 import os
 import importlib.util
+import numpy as np
 import pandas as pd
 from typing import Dict, Any, Callable
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Import the backtest engine
 # Assuming the backtester module is in the same directory
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -120,26 +126,64 @@ def run_backtest(args):
     # Run backtest
     results = backtester.run_strategy(strategy_func, params, args.timeframe)
     
-    # Format equity curve for JSON serialization
-    for point in results['equity_curve']:
-        point['datetime'] = point['datetime'].isoformat()
+    # Format equity curve for JSON serialization as parallel arrays of
+    # epoch milliseconds and equity values
+    equity_curve = results['equity_curve']
+    results['equity_curve'] = {
+        'time': _epoch_ms(equity_curve.index),
+        'equity': equity_curve.to_numpy(dtype=np.float64)
+    }
     
-    # Format trades for JSON serialization
+    # Format trades for JSON serialization, with times on the same epoch
+    # millisecond basis as the equity curve
     if 'trades' in results:
-        for trade in results['trades']:
-            if 'datetime' in trade:
-                trade['datetime'] = trade['datetime'].isoformat()
+        trades = results['trades']
+        results['trades'] = trades.to_records()
+        for trade, time in zip(results['trades'], _epoch_ms(trades.datetime).tolist()):
+            trade['datetime'] = time
     
     return results
 
 
+def _epoch_ms(index: pd.DatetimeIndex) -> np.ndarray:
+    """
+    Convert timestamps to epoch milliseconds (naive timestamps are taken as UTC).
+    """
+    return index.values.astype('datetime64[ms]').astype(np.int64)
+
+
+def _json_default(obj):
+    """
+    Convert NumPy values that the standard json module cannot serialize.
+    """
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def write_results(results: Dict[str, Any]):
+    """
+    Write backtest results as JSON to stdout (for the Node.js process to capture).
+    
+    Uses orjson when installed, which serializes NumPy arrays natively.
+    
+    Args:
+        results: Dictionary with backtest results
+    """
+    if orjson is not None:
+        sys.stdout.buffer.write(orjson.dumps(results, option=orjson.OPT_SERIALIZE_NUMPY))
+        sys.stdout.buffer.flush()
+    else:
+        print(json.dumps(results, default=_json_default))
+
+
 if __name__ == "__main__":
     try:
         args = parse_arguments()
         results = run_backtest(args)
         
         # Print results as JSON to stdout (for the Node.js process to capture)
-        print(json.dumps(results))
+        write_results(results)
     except Exception as e:
         # Print error as JSON to stderr
         error_json = json.dumps({
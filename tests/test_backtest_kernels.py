@@ -0,0 +1,125 @@
+"""
+Equivalence tests for the backtest kernels.
+
+The event-driven simulator is checked against a bar-by-bar reference loop
+(the engine's original implementation), and the fused SMA/RSI signal kernels
+against the array-based strategy path used when numba is not installed.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lib'))
+import backtest_engine
+from backtest_engine import StrategyLibrary
+from backtest_kernels import BUY, SELL, simulate
+
+
+def make_close(n: int = 5000, seed: int = 0, nan_gaps: bool = False) -> np.ndarray:
+    """
+    Synthetic BTC-scale random walk with a flat stretch and optional NaN gaps.
+    """
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+    close[n // 2:n // 2 + 40] = close[n // 2]
+    if nan_gaps:
+        close[rng.integers(1, n, 15)] = np.nan
+    return close
+
+
+def make_signal(n: int, seed: int = 0) -> np.ndarray:
+    """
+    Random buy/sell signals, including repeated signals in the same direction.
+    """
+    rng = np.random.default_rng(seed)
+    return rng.choice([-1.0, 0.0, 1.0], size=n, p=[0.02, 0.96, 0.02])
+
+
+def reference_simulate(close: np.ndarray, signal: np.ndarray,
+                       initial_capital: float, commission: float):
+    """
+    Bar-by-bar long-only simulation, as the engine originally ran it.
+    """
+    capital = initial_capital
+    in_position = False
+    size = 0.0
+    entry_price = 0.0
+    trades = []
+    equity = np.empty(len(close))
+
+    for i, price in enumerate(close):
+        equity[i] = capital + size * (price - entry_price) if in_position else capital
+
+        if signal[i] > 0 and not in_position:
+            in_position = True
+            entry_price = price
+            size = capital * (1 - commission) / price
+            trades.append((i, BUY, price, size, np.nan))
+        elif signal[i] < 0 and in_position:
+            exit_value = size * price * (1 - commission)
+            trades.append((i, SELL, price, size, exit_value - size * entry_price))
+            capital = exit_value
+            in_position = False
+
+    if in_position:
+        price = close[-1]
+        exit_value = size * price * (1 - commission)
+        trades.append((len(close) - 1, SELL, price, size, exit_value - size * entry_price))
+
+    return trades, equity
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+@pytest.mark.parametrize('nan_gaps', [False, True])
+@pytest.mark.parametrize('commission', [0.0, 0.001])
+def test_simulate_matches_bar_by_bar_loop(seed, nan_gaps, commission):
+    close = make_close(seed=seed, nan_gaps=nan_gaps)
+    signal = make_signal(len(close), seed)
+
+    trade_idx, trade_type, trade_price, trade_size, trade_pl, equity = simulate(
+        close, signal, 10000.0, commission)
+    trades, expected_equity = reference_simulate(close, signal, 10000.0, commission)
+
+    np.testing.assert_array_equal(equity, expected_equity)
+    assert len(trade_idx) == len(trades)
+    idx, kind, price, size, pl = (np.array(col) for col in zip(*trades))
+    np.testing.assert_array_equal(trade_idx, idx)
+    np.testing.assert_array_equal(trade_type, kind)
+    np.testing.assert_array_equal(trade_price, price)
+    np.testing.assert_array_equal(trade_size, size)
+    np.testing.assert_array_equal(trade_pl, pl)
+
+
+def test_simulate_without_signals_keeps_capital():
+    close = make_close(100)
+    trade_idx, _, _, _, _, equity = simulate(close, np.zeros(100), 10000.0, 0.001)
+
+    assert len(trade_idx) == 0
+    np.testing.assert_array_equal(equity, np.full(100, 10000.0))
+
+
+@pytest.mark.parametrize('strategy, params', [
+    (StrategyLibrary.simple_moving_average_crossover, {}),
+    (StrategyLibrary.simple_moving_average_crossover, {'fast_period': 3, 'slow_period': 7}),
+    (StrategyLibrary.rsi_strategy, {}),
+    (StrategyLibrary.rsi_strategy, {'period': 2}),
+    (StrategyLibrary.rsi_strategy, {'period': 5, 'overbought': 80, 'oversold': 20}),
+])
+@pytest.mark.parametrize('nan_gaps', [False, True])
+def test_fused_kernels_match_array_path(monkeypatch, strategy, params, nan_gaps):
+    close = make_close(seed=3, nan_gaps=nan_gaps)
+    data = pd.DataFrame({'close': close},
+                        index=pd.date_range('2023-01-01', periods=len(close), freq='15min'))
+
+    monkeypatch.setattr(backtest_engine, 'NUMBA_AVAILABLE', True)
+    fused = strategy(data, params)
+    monkeypatch.setattr(backtest_engine, 'NUMBA_AVAILABLE', False)
+    array_path = strategy(data, params)
+
+    assert (array_path != 0).any()
+    np.testing.assert_array_equal(fused.to_numpy(), array_path.to_numpy())
+    assert fused.index.equals(array_path.index)